@@ -1,13 +1,49 @@
-from flask import Flask, request, jsonify, render_template_string, session, redirect, url_for
+from flask import Flask, g, request, redirect, url_for
+from flask_compress import Compress
 from flask_cors import CORS
 import gspread
+import jwt
+import msgspec
+import orjson
 from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
+import hashlib
+import hmac
 import json
+import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 
+# Log records go onto a queue and a listener thread does the actual stream
+# I/O, so request handlers never block on a synchronous stdout write
+_LOG_QUEUE = queue.Queue(-1)
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, logging.StreamHandler())
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+log.addHandler(logging.handlers.QueueHandler(_LOG_QUEUE))
+
 app = Flask(__name__)
+# Gzip responses when the client accepts it - the CSS-heavy pages and the
+# registrations JSON compress to a fraction of their size
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+# Static assets (the page stylesheets) are immutable per deploy, so let
+# browsers cache them for a year instead of re-downloading per page load
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
 # Configure CORS more specifically
 CORS(app, resources={
     r"/submit-registration": {
@@ -23,642 +59,692 @@ CORS(app, resources={
 })
 app.secret_key = os.getenv('SECRET_KEY', 'k')
 
+def ojson(payload, status=200):
+    """jsonify replacement backed by orjson's much faster C serializer"""
+    return app.response_class(orjson.dumps(payload), status=status,
+                              mimetype='application/json')
+
 # Google Sheets setup
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Cached Sheet handle - authorizing and opening the spreadsheet costs several
+# round trips to Google, so do it once per process instead of per request
+_SHEET = None
+_SHEET_LOCK = threading.Lock()
+
+def _init_sheet():
+    """Authorize gspread and open the spreadsheet (called once per process)"""
+    # Load credentials
+    creds_dict = None
+    if os.getenv('GOOGLE_CREDENTIALS'):
+        creds_dict = json.loads(os.getenv('GOOGLE_CREDENTIALS'))
+    else:
+        with open('credentials.json', 'r') as f:
+            creds_dict = json.load(f)
+
+    creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+    client = gspread.authorize(creds)
+
+    # Pool keep-alive connections so each Sheets call reuses a warm TLS
+    # connection instead of setting up its own. Only connection failures are
+    # retried here - 429/5xx responses must surface as APIError so
+    # with_backoff stays the one retry policy and can honor Retry-After
+    client.session.headers['Connection'] = 'keep-alive'
+    client.session.mount('https://', HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=5, backoff_factor=0.5),
+    ))
+
+    # Access the sheet
+    sheet_id = os.getenv('GOOGLE_SHEET_ID')
+    sheet = client.open_by_key(sheet_id).sheet1
+
+    # Optional: create headers if sheet is empty (one cell-range read
+    # instead of fetching and parsing the whole sheet)
+    header_row = sheet.row_values(1)
+    if not header_row:
+        headers = [
+            'Timestamp',
+            'Player 1 Name',
+            'Player 1 Age',
+            'Player 1 Form',
+            'Player 1 Payment Agreement',
+            'Player 2 Name',
+            'Player 2 Age',
+            'Player 2 Form',
+            'Player 2 Payment Agreement',
+            'Team ID'
+        ]
+        sheet.append_row(headers)
+
+    return sheet
+
 def get_google_sheet():
-    """Initialize and return the Google Sheet"""
+    """Return the cached Google Sheet, initializing it on first use"""
+    global _SHEET
     try:
-        import gspread
-        from google.oauth2.service_account import Credentials
+        # The lock keeps concurrent first requests from each running
+        # _init_sheet() and double-appending the header row
+        with _SHEET_LOCK:
+            if _SHEET is None:
+                _SHEET = _init_sheet()
+            return _SHEET
 
-        # Load credentials
-        creds_dict = None
-        if os.getenv('GOOGLE_CREDENTIALS'):
-            creds_dict = json.loads(os.getenv('GOOGLE_CREDENTIALS'))
-        else:
-            with open('credentials.json', 'r') as f:
-                creds_dict = json.load(f)
-
-        creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-        client = gspread.authorize(creds)
-
-        # Access the sheet
-        sheet_id = os.getenv('GOOGLE_SHEET_ID')
-        sheet = client.open_by_key(sheet_id).sheet1
-
-        # Optional: create headers if sheet is empty
-        if sheet.row_count == 0 or not sheet.get_all_records():
-            headers = [
-                'Timestamp',
-                'Player 1 Name',
-                'Player 1 Age',
-                'Player 1 Form',
-                'Player 1 Payment Agreement',
-                'Player 2 Name',
-                'Player 2 Age',
-                'Player 2 Form',
-                'Player 2 Payment Agreement',
-                'Team ID'
-            ]
-            sheet.append_row(headers)
-
-        return sheet
+    except Exception:
+        log.exception("Google Sheets error")
+        return None
 
-    except Exception as e:
-        print(f"[Google Sheets Error] {e}")
+
+# Status codes worth retrying: rate limiting and transient server errors
+_RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+def with_backoff(max_tries=5, base=0.5):
+    """Retry transient Sheets API errors with exponential backoff
+
+    Honors the Retry-After header on 429 responses, so a rate-limited call
+    waits instead of surfacing a 500 to the client and dropping the data.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_tries):
+                try:
+                    return f(*args, **kwargs)
+                except gspread.exceptions.APIError as e:
+                    status = e.response.status_code
+                    if status not in _RETRYABLE_STATUSES or attempt == max_tries - 1:
+                        raise
+                    delay = base * 2 ** attempt + random.uniform(0, base)
+                    retry_after = e.response.headers.get('Retry-After')
+                    if retry_after:
+                        delay = max(delay, float(retry_after))
+                    log.warning("Sheets API returned %s, retrying in %.1fs",
+                                status, delay)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
+@with_backoff()
+def _sheet_call(fn, *args, **kwargs):
+    """Run a gspread method with retry on transient API errors"""
+    return fn(*args, **kwargs)
+
+
+# Team ID -> sheet row index, so payment updates usually need no read
+# round trip at all; built lazily from one Team ID column read and kept in
+# sync as the flusher appends rows
+_TEAM_ROW = {}
+_TEAM_ROW_LOCK = threading.Lock()
+_TEAM_ROW_LOADED = False
+
+def _team_row(sheet, team_id):
+    """Resolve a team's row index, preferring the in-memory index"""
+    global _TEAM_ROW_LOADED
+    with _TEAM_ROW_LOCK:
+        if team_id in _TEAM_ROW:
+            return _TEAM_ROW[team_id]
+        load = not _TEAM_ROW_LOADED
+    if load:
+        col = _sheet_call(sheet.col_values, 10)
+        with _TEAM_ROW_LOCK:
+            for i, tid in enumerate(col):
+                if i > 0 and tid:  # skip the header row
+                    _TEAM_ROW.setdefault(tid, i + 1)
+            _TEAM_ROW_LOADED = True
+            if team_id in _TEAM_ROW:
+                return _TEAM_ROW[team_id]
+    # Index miss - fall back to a targeted find on the Team ID column
+    cell = _sheet_call(sheet.find, team_id, in_column=10)
+    if cell is None:
         return None
+    with _TEAM_ROW_LOCK:
+        _TEAM_ROW[team_id] = cell.row
+    return cell.row
+
+
+# Pending registration rows, flushed to Sheets in batches by a background
+# thread so submissions don't block on a write round trip
+_PENDING = queue.Queue()
+_FLUSH_INTERVAL = 0.5  # seconds
+_FLUSH_BATCH_SIZE = 50
+
+def _flush_pending():
+    """Drain queued registration rows and append them to the sheet in batches"""
+    while True:
+        rows = [_PENDING.get()]
+        # Give the batch a moment to fill, then drain whatever is queued
+        deadline = time.monotonic() + _FLUSH_INTERVAL
+        while len(rows) < _FLUSH_BATCH_SIZE:
+            try:
+                rows.append(_PENDING.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        try:
+            sheet = get_google_sheet()
+            if sheet is None:
+                raise RuntimeError("Cannot connect to Google Sheets")
+            resp = _sheet_call(sheet.append_rows, rows,
+                               value_input_option='RAW',
+                               insert_data_option='INSERT_ROWS')
+            # Record where the rows landed (last cell is the Team ID) so
+            # payment updates can skip the lookup round trip
+            landed = re.search(r'![A-Z]+(\d+)', resp['updates']['updatedRange'])
+            if landed:
+                start = int(landed.group(1))
+                with _TEAM_ROW_LOCK:
+                    for offset, row_data in enumerate(rows):
+                        _TEAM_ROW[row_data[-1]] = start + offset
+            _invalidate_records_cache()
+        except Exception as e:
+            # Rows are already journaled locally, so nothing is lost
+            log.exception("Error flushing registrations to sheet")
+
+threading.Thread(target=_flush_pending, daemon=True).start()
+
+
+# Sheet records are cached briefly so repeated dashboard refreshes don't
+# each re-fetch and re-parse the whole sheet
+_RECORDS_CACHE = {'ts': 0, 'data': None}
+_RECORDS_TTL = 15  # seconds
+_RECORDS_LOCK = threading.Lock()
+
+def get_cached_records(sheet):
+    """Return the sheet's records, re-fetching at most once per TTL window"""
+    global _TEAM_ROW_LOADED
+    with _RECORDS_LOCK:
+        if (_RECORDS_CACHE['data'] is None
+                or time.monotonic() - _RECORDS_CACHE['ts'] > _RECORDS_TTL):
+            records = _sheet_call(sheet.get_all_records)
+            _RECORDS_CACHE['data'] = records
+            _RECORDS_CACHE['ts'] = time.monotonic()
+            # A fresh snapshot is authoritative - rebuild the row index from
+            # it so entries invalidated by manual sheet edits get corrected
+            with _TEAM_ROW_LOCK:
+                _TEAM_ROW.clear()
+                for i, record in enumerate(records):
+                    tid = record.get('Team ID')
+                    if tid:
+                        _TEAM_ROW[tid] = i + 2  # 1-indexed plus header row
+                _TEAM_ROW_LOADED = True
+        return _RECORDS_CACHE['data']
 
+def _invalidate_records_cache():
+    """Force the next records read to re-fetch from the sheet"""
+    with _RECORDS_LOCK:
+        _RECORDS_CACHE['data'] = None
+
+
+# Page templates, compiled once at import time so Jinja does not re-parse
+# them on every request
+DASHBOARD_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Teacher Dashboard - Tournament Registrations</title>
+    <link rel="stylesheet" href="{{ url_for('static', filename='dashboard.css') }}">
+</head>
+<body>
+    <div class="container">
+        <div class="header-section">
+            <h1>🎮 Tournament Dashboard</h1>
+            <a href="/teacher/logout" class="logout-btn">Logout</a>
+        </div>
+        
+        <div class="stats">
+            <div class="stat-item">
+                <span class="stat-number" id="total-count">-</span>
+                <span class="stat-label">Total Teams</span>
+            </div>
+            <div class="stat-item">
+                <span class="stat-number" id="full-payment-count">-</span>
+                <span class="stat-label">Full Payment</span>
+            </div>
+            <div class="stat-item">
+                <span class="stat-number" id="partial-payment-count">-</span>
+                <span class="stat-label">Partial Payment</span>
+            </div>
+            <div class="stat-item">
+                <span class="stat-number" id="no-payment-count">-</span>
+                <span class="stat-label">No Payment</span>
+            </div>
+        </div>
+        
+        <table>
+            <thead>
+                <tr>
+                    <th>Team ID</th>
+                    <th>Timestamp</th>
+                    <th>Player 1</th>
+                    <th>Age</th>
+                    <th>Form</th>
+                    <th>P1 Payment</th>
+                    <th>Player 2</th>
+                    <th>Age</th>
+                    <th>Form</th>
+                    <th>P2 Payment</th>
+                    <th>Actions</th>
+                </tr>
+            </thead>
+            <tbody id="registrations-body">
+            </tbody>
+        </table>
+    </div>
+
+    <script>
+        // The shell is served instantly; registrations are fetched as JSON
+        // and rendered here so the page never waits on a full sheet read
+        function escapeHtml(value) {
+            const div = document.createElement('div');
+            div.textContent = value == null ? '' : String(value);
+            return div.innerHTML;
+        }
+
+        function paymentSpan(status) {
+            const cls = status === 'Yes' ? 'payment-yes' : 'payment-no';
+            return `<span class="${cls}">${escapeHtml(status)}</span>`;
+        }
+
+        function renderTable(records) {
+            let full = 0, partial = 0, none = 0;
+            const rows = [];
+            for (const record of records) {
+                const teamId = record['Team ID'];
+                const p1Paid = record['Player 1 Payment Agreement'] === 'Yes';
+                const p2Paid = record['Player 2 Payment Agreement'] === 'Yes';
+                if (p1Paid && p2Paid) full++;
+                else if (p1Paid || p2Paid) partial++;
+                else none++;
+                rows.push(`<tr>
+                    <td><span class="team-id">${escapeHtml(teamId)}</span></td>
+                    <td>${escapeHtml(record['Timestamp'])}</td>
+                    <td><strong>${escapeHtml(record['Player 1 Name'])}</strong></td>
+                    <td>${escapeHtml(record['Player 1 Age'])}</td>
+                    <td>${escapeHtml(record['Player 1 Form'])}</td>
+                    <td>${paymentSpan(record['Player 1 Payment Agreement'])}</td>
+                    <td><strong>${escapeHtml(record['Player 2 Name'])}</strong></td>
+                    <td>${escapeHtml(record['Player 2 Age'])}</td>
+                    <td>${escapeHtml(record['Player 2 Form'])}</td>
+                    <td>${paymentSpan(record['Player 2 Payment Agreement'])}</td>
+                    <td>
+                        <button class="update-btn btn-yes" onclick="updatePayment('${escapeHtml(teamId)}', 'player1', 'Yes')">P1: ✓</button>
+                        <button class="update-btn btn-no" onclick="updatePayment('${escapeHtml(teamId)}', 'player1', 'No')">P1: ✗</button>
+                        <br>
+                        <button class="update-btn btn-yes" onclick="updatePayment('${escapeHtml(teamId)}', 'player2', 'Yes')">P2: ✓</button>
+                        <button class="update-btn btn-no" onclick="updatePayment('${escapeHtml(teamId)}', 'player2', 'No')">P2: ✗</button>
+                    </td>
+                </tr>`);
+            }
+            document.getElementById('registrations-body').innerHTML = rows.join('');
+            document.getElementById('total-count').textContent = records.length;
+            document.getElementById('full-payment-count').textContent = full;
+            document.getElementById('partial-payment-count').textContent = partial;
+            document.getElementById('no-payment-count').textContent = none;
+        }
+
+        function loadRegistrations() {
+            fetch('/get-registrations')
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        renderTable(data.registrations);
+                    } else {
+                        alert('Error loading registrations: ' + data.error);
+                    }
+                })
+                .catch(error => {
+                    console.error('Error:', error);
+                    alert('Error loading registrations');
+                });
+        }
+
+        loadRegistrations();
+
+        // Clicks are buffered briefly and sent as one batched request so
+        // toggling both players costs a single write
+        let pendingUpdates = [];
+        let flushTimer = null;
+
+        function updatePayment(teamId, player, status) {
+            pendingUpdates.push({
+                team_id: teamId,
+                player: player,
+                payment_status: status
+            });
+            clearTimeout(flushTimer);
+            flushTimer = setTimeout(flushUpdates, 300);
+        }
+
+        function flushUpdates() {
+            const updates = pendingUpdates;
+            pendingUpdates = [];
+            fetch('/teacher/update-payment', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ updates: updates })
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    location.reload();
+                } else {
+                    alert('Error updating payment: ' + data.error);
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('Error updating payment');
+            });
+        }
+    </script>
+</body>
+</html>
+"""
+
+LOGIN_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Teacher Login</title>
+    <link rel="stylesheet" href="{{ url_for('static', filename='login.css') }}">
+</head>
+<body>
+    <div class="login-container">
+        <div class="login-icon">🎮</div>
+        <h2>Teacher Dashboard</h2>
+        <p class="subtitle">Tournament Management Portal</p>
+        <form method="POST">
+            <input type="password" name="password" placeholder="Enter teacher password" required>
+            <button type="submit">Access Dashboard</button>
+            {% if error %}
+            <div class="error">{{ error }}</div>
+            {% endif %}
+        </form>
+    </div>
+</body>
+</html>
+"""
+
+def _minify(html):
+    """Drop indentation and blank lines from a template string"""
+    return '\n'.join(line.strip() for line in html.split('\n') if line.strip())
+
+_DASHBOARD_TPL = app.jinja_env.from_string(_minify(DASHBOARD_HTML))
+_LOGIN_TPL = app.jinja_env.from_string(_minify(LOGIN_HTML))
+
+
+# Teacher auth uses a short-lived signed token in an HttpOnly cookie -
+# verifying it is a single HMAC check, cheaper than unpacking a session
+# on every dashboard fetch
+TOKEN_COOKIE = 'teacher_token'
+TOKEN_TTL = 3600  # seconds
+
+# Expected teacher password digest, resolved once at import so logins don't
+# re-read the environment; comparing digests keeps the check constant-time
+TEACHER_PW_HASH = hashlib.sha256(
+    os.getenv('TEACHER_PASSWORD', 'admin123').encode()).digest()
+
+@app.before_request
+def load_teacher_auth():
+    """Decode the teacher token once per request and stash it on g"""
+    g.teacher = None
+    token = request.cookies.get(TOKEN_COOKIE)
+    if token:
+        try:
+            g.teacher = jwt.decode(token, app.secret_key, algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            pass
 
 def require_teacher_auth(f):
     """Decorator to require teacher authentication"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'teacher_authenticated' not in session or not session['teacher_authenticated']:
+        if g.teacher is None:
             return redirect(url_for('teacher_login'))
         return f(*args, **kwargs)
     return decorated_function
 
+# The tournament form is read once at startup and served from memory with
+# an ETag, so repeat visitors get a 304 instead of a fresh download and the
+# handler never touches the disk
+try:
+    with open(os.path.join(app.root_path, 'index.html'), 'rb') as f:
+        _INDEX_HTML = f.read()
+    _INDEX_ETAG = hashlib.md5(_INDEX_HTML).hexdigest()
+except FileNotFoundError:
+    _INDEX_HTML = None
+    _INDEX_ETAG = None
+
 @app.route('/')
 def home():
     """Serve the tournament form"""
-    try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
+    if _INDEX_HTML is None:
         return """
         <h1>Error: index.html not found</h1>
         <p>Make sure index.html is in the same folder as this Python file.</p>
         <p><a href="/teacher">Teacher Dashboard</a></p>
         """
+    response = app.response_class(_INDEX_HTML, mimetype='text/html')
+    response.set_etag(_INDEX_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return ojson({"status": "healthy", "timestamp": datetime.now().isoformat()})
+
+class Player(msgspec.Struct):
+    """One player's registration fields as submitted by the form"""
+    fullName: str = ''
+    age: int = 0
+    formNumber: str = ''
+    formName: str = ''
+    paymentAgreement: bool = False
+
+class Registration(msgspec.Struct):
+    """A two-player registration submission"""
+    player1: Player
+    player2: Player
+
+def _form(player):
+    """Format a player's form number and name as a single cell value"""
+    return ' '.join(filter(None, (player.formNumber, player.formName)))
 
 @app.route('/submit-registration', methods=['POST'])
 def submit_registration():
     """Handle tournament registration submission"""
     try:
-        # Get JSON data from request
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "No data received"}), 400
-        
-        # Validate required fields
-        required_fields = ['player1', 'player2']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing {field} data"}), 400
-        
-        # Extract player data
-        player1 = data['player1']
-        player2 = data['player2']
-        
-        # Validate ages (must be between 11-14)
+        # Decode and validate the body in one C-level pass instead of
+        # get_json() followed by hand-rolled field checks
         try:
-            player1_age = int(player1.get('age', 0))
-            player2_age = int(player2.get('age', 0))
-            
-            if not (11 <= player1_age <= 14):
-                return jsonify({"error": "Player 1 age must be between 11-14"}), 400
-            if not (11 <= player2_age <= 14):
-                return jsonify({"error": "Player 2 age must be between 11-14"}), 400
-                
-        except (ValueError, TypeError):
-            return jsonify({"error": "Invalid age provided"}), 400
-        
-        # Generate a team ID
-        team_id = f"TEAM_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
+            reg = msgspec.json.decode(request.get_data(), type=Registration,
+                                      strict=False)
+        except msgspec.ValidationError as e:
+            return ojson({"error": str(e)}, 400)
+        except msgspec.DecodeError:
+            return ojson({"error": "No data received"}, 400)
+
+        player1 = reg.player1
+        player2 = reg.player2
+
+        # Validate ages (must be between 11-14)
+        if not (11 <= player1.age <= 14):
+            return ojson({"error": "Player 1 age must be between 11-14"}, 400)
+        if not (11 <= player2.age <= 14):
+            return ojson({"error": "Player 2 age must be between 11-14"}, 400)
+
+        # Read the clock once so the team ID, row timestamp and response
+        # timestamp all agree; the random suffix keeps team IDs unique even
+        # when two submissions land in the same second
+        now = datetime.now()
+        team_id = f"TEAM_{now.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
         # Prepare row data - Set both payment agreements to "No" initially
         row_data = [
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            player1.get('fullName', ''),
-            str(player1_age),
-            f"{player1.get('formNumber', '')} {player1.get('formName', '')}".strip(),
+            now.strftime('%Y-%m-%d %H:%M:%S'),
+            player1.fullName,
+            str(player1.age),
+            _form(player1),
             'No',  # Player 1 payment agreement set to No
-            player2.get('fullName', ''),
-            str(player2_age),
-            f"{player2.get('formNumber', '')} {player2.get('formName', '')}".strip(),
+            player2.fullName,
+            str(player2.age),
+            _form(player2),
             'No',  # Player 2 payment agreement set to No
             team_id
         ]
         
-        # Try to save to Google Sheets
-        sheet = get_google_sheet()
-        if sheet:
-            sheet.append_row(row_data)
-            sheet_success = True
-        else:
-            sheet_success = False
-            # Fallback: save to local file or database
-            save_to_local_file(row_data)
-        
+        # Journal locally, then hand the row to the background flusher so the
+        # response doesn't wait on a Sheets write
+        save_to_local_file(row_data)
+        _PENDING.put(row_data)
+
         # Return success response
         response_data = {
             "success": True,
             "message": "Registration submitted successfully!",
             "team_id": team_id,
-            "saved_to_sheets": sheet_success,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
-        
-        return jsonify(response_data), 200
+
+        return ojson(response_data, 202)
         
     except Exception as e:
-        print(f"Error processing registration: {e}")
-        return jsonify({
+        log.exception("Error processing registration")
+        return ojson({
             "error": "Failed to process registration", 
             "details": str(e)
-        }), 500
+        }, 500)
 
 @app.route('/teacher')
 @require_teacher_auth
 def teacher_dashboard():
-    """Teacher dashboard to view and manage registrations"""
-    try:
-        sheet = get_google_sheet()
-        if not sheet:
-            return "Error: Cannot connect to Google Sheets", 500
-        
-        records = sheet.get_all_records()
-        
-        # HTML template for the teacher dashboard
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Teacher Dashboard - Tournament Registrations</title>
-            <style>
-                body { 
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                    margin: 0; 
-                    padding: 20px; 
-                    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                    min-height: 100vh;
-                    color: white;
-                }
-                .container {
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background: rgba(255, 255, 255, 0.95);
-                    border-radius: 15px;
-                    padding: 30px;
-                    box-shadow: 0 10px 30px rgba(0, 0, 0, 0.3);
-                    color: #1e3c72;
-                }
-                table { 
-                    border-collapse: collapse; 
-                    width: 100%; 
-                    margin-top: 20px; 
-                    background: white;
-                    border-radius: 10px;
-                    overflow: hidden;
-                    box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-                }
-                th, td { 
-                    border: 1px solid #e3f2fd; 
-                    padding: 12px; 
-                    text-align: left; 
-                }
-                th { 
-                    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                    color: white;
-                    font-weight: 600;
-                    text-transform: uppercase;
-                    font-size: 12px;
-                    letter-spacing: 1px;
-                }
-                tr:nth-child(even) { background-color: #f8fbff; }
-                tr:hover { background-color: #e3f2fd; transition: background-color 0.3s; }
-                .payment-yes { 
-                    background-color: #c8e6c9; 
-                    color: #2e7d32; 
-                    font-weight: bold;
-                    text-align: center;
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-                .payment-no { 
-                    background-color: #ffcdd2; 
-                    color: #c62828; 
-                    font-weight: bold;
-                    text-align: center;
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-                .update-btn { 
-                    padding: 6px 12px; 
-                    margin: 2px; 
-                    cursor: pointer; 
-                    border: none;
-                    border-radius: 5px;
-                    font-size: 11px;
-                    font-weight: bold;
-                    transition: all 0.3s ease;
-                }
-                .btn-yes { 
-                    background: linear-gradient(135deg, #4caf50 0%, #66bb6a 100%); 
-                    color: white; 
-                }
-                .btn-yes:hover { 
-                    background: linear-gradient(135deg, #388e3c 0%, #4caf50 100%);
-                    transform: translateY(-1px);
-                }
-                .btn-no { 
-                    background: linear-gradient(135deg, #f44336 0%, #e57373 100%); 
-                    color: white; 
-                }
-                .btn-no:hover { 
-                    background: linear-gradient(135deg, #d32f2f 0%, #f44336 100%);
-                    transform: translateY(-1px);
-                }
-                .logout-btn { 
-                    float: right; 
-                    padding: 12px 20px; 
-                    background: linear-gradient(135deg, #37474f 0%, #546e7a 100%); 
-                    color: white; 
-                    text-decoration: none; 
-                    border-radius: 25px;
-                    font-weight: bold;
-                    transition: all 0.3s ease;
-                    box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-                }
-                .logout-btn:hover {
-                    transform: translateY(-2px);
-                    box-shadow: 0 6px 20px rgba(0, 0, 0, 0.3);
-                }
-                h1 { 
-                    color: #1e3c72; 
-                    text-align: center;
-                    font-size: 2.5rem;
-                    margin-bottom: 10px;
-                    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
-                }
-                .stats { 
-                    margin: 20px 0; 
-                    padding: 20px; 
-                    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); 
-                    border-radius: 10px; 
-                    color: white;
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 15px;
-                    box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
-                }
-                .stat-item {
-                    text-align: center;
-                    padding: 10px;
-                    background: rgba(255, 255, 255, 0.1);
-                    border-radius: 8px;
-                    border: 1px solid rgba(255, 255, 255, 0.2);
-                }
-                .stat-number {
-                    font-size: 2rem;
-                    font-weight: bold;
-                    display: block;
-                    color: #ffd54f;
-                }
-                .stat-label {
-                    font-size: 0.9rem;
-                    opacity: 0.9;
-                }
-                .header-section {
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    margin-bottom: 20px;
-                    flex-wrap: wrap;
-                }
-                .team-id {
-                    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 12px;
-                    font-weight: bold;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header-section">
-                    <h1>🎮 Tournament Dashboard</h1>
-                    <a href="/teacher/logout" class="logout-btn">Logout</a>
-                </div>
-                
-                <div class="stats">
-                    <div class="stat-item">
-                        <span class="stat-number">{{ total_count }}</span>
-                        <span class="stat-label">Total Teams</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-number">{{ full_payment_count }}</span>
-                        <span class="stat-label">Full Payment</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-number">{{ partial_payment_count }}</span>
-                        <span class="stat-label">Partial Payment</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="stat-number">{{ no_payment_count }}</span>
-                        <span class="stat-label">No Payment</span>
-                    </div>
-                </div>
-                
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Team ID</th>
-                            <th>Timestamp</th>
-                            <th>Player 1</th>
-                            <th>Age</th>
-                            <th>Form</th>
-                            <th>P1 Payment</th>
-                            <th>Player 2</th>
-                            <th>Age</th>
-                            <th>Form</th>
-                            <th>P2 Payment</th>
-                            <th>Actions</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for record in records %}
-                        <tr>
-                            <td><span class="team-id">{{ record['Team ID'] }}</span></td>
-                            <td>{{ record['Timestamp'] }}</td>
-                            <td><strong>{{ record['Player 1 Name'] }}</strong></td>
-                            <td>{{ record['Player 1 Age'] }}</td>
-                            <td>{{ record['Player 1 Form'] }}</td>
-                            <td>
-                                <span class="{% if record['Player 1 Payment Agreement'] == 'Yes' %}payment-yes{% else %}payment-no{% endif %}">
-                                    {{ record['Player 1 Payment Agreement'] }}
-                                </span>
-                            </td>
-                            <td><strong>{{ record['Player 2 Name'] }}</strong></td>
-                            <td>{{ record['Player 2 Age'] }}</td>
-                            <td>{{ record['Player 2 Form'] }}</td>
-                            <td>
-                                <span class="{% if record['Player 2 Payment Agreement'] == 'Yes' %}payment-yes{% else %}payment-no{% endif %}">
-                                    {{ record['Player 2 Payment Agreement'] }}
-                                </span>
-                            </td>
-                            <td>
-                                <button class="update-btn btn-yes" onclick="updatePayment('{{ record['Team ID'] }}', 'player1', 'Yes')">P1: ✓</button>
-                                <button class="update-btn btn-no" onclick="updatePayment('{{ record['Team ID'] }}', 'player1', 'No')">P1: ✗</button>
-                                <br>
-                                <button class="update-btn btn-yes" onclick="updatePayment('{{ record['Team ID'] }}', 'player2', 'Yes')">P2: ✓</button>
-                                <button class="update-btn btn-no" onclick="updatePayment('{{ record['Team ID'] }}', 'player2', 'No')">P2: ✗</button>
-                            </td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
+    """Teacher dashboard to view and manage registrations
 
-            <script>
-                function updatePayment(teamId, player, status) {
-                    fetch('/teacher/update-payment', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            team_id: teamId,
-                            player: player,
-                            payment_status: status
-                        })
-                    })
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.success) {
-                            location.reload();
-                        } else {
-                            alert('Error updating payment: ' + data.error);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error:', error);
-                        alert('Error updating payment');
-                    });
-                }
-            </script>
-        </body>
-        </html>
-        """
-        
-        # Calculate statistics
-        total_count = len(records)
-        full_payment_count = sum(1 for r in records if r.get('Player 1 Payment Agreement') == 'Yes' and r.get('Player 2 Payment Agreement') == 'Yes')
-        partial_payment_count = sum(1 for r in records if (r.get('Player 1 Payment Agreement') == 'Yes') != (r.get('Player 2 Payment Agreement') == 'Yes'))
-        no_payment_count = sum(1 for r in records if r.get('Player 1 Payment Agreement') == 'No' and r.get('Player 2 Payment Agreement') == 'No')
-        
-        return render_template_string(html_template, 
-                                    records=records,
-                                    total_count=total_count,
-                                    full_payment_count=full_payment_count,
-                                    partial_payment_count=partial_payment_count,
-                                    no_payment_count=no_payment_count)
-        
-    except Exception as e:
-        return f"Error loading dashboard: {str(e)}", 500
+    Serves only the page shell; the browser fetches /get-registrations as
+    JSON and renders the table and stats client-side, so the response never
+    waits on a full sheet read.
+    """
+    return _DASHBOARD_TPL.render()
 
 @app.route('/teacher/login', methods=['GET', 'POST'])
 def teacher_login():
     """Teacher login page"""
     if request.method == 'POST':
-        password = request.form.get('password') or request.json.get('password') if request.is_json else None
-        teacher_password = os.getenv('TEACHER_PASSWORD', 'admin123')  # Default password if not set
-        
-        if password == teacher_password:
-            session['teacher_authenticated'] = True
-            return redirect(url_for('teacher_dashboard'))
+        if request.is_json:
+            password = (request.get_json(silent=True) or {}).get('password')
+        else:
+            password = request.form.get('password')
+
+        submitted = hashlib.sha256((password or '').encode()).digest()
+        if hmac.compare_digest(submitted, TEACHER_PW_HASH):
+            token = jwt.encode(
+                {'exp': datetime.now(timezone.utc) + timedelta(seconds=TOKEN_TTL),
+                 'role': 'teacher'},
+                app.secret_key, algorithm='HS256')
+            response = redirect(url_for('teacher_dashboard'))
+            response.set_cookie(TOKEN_COOKIE, token, max_age=TOKEN_TTL,
+                                httponly=True, samesite='Lax')
+            return response
         else:
             error = "Invalid password"
             if request.is_json:
-                return jsonify({"error": error}), 401
-            return render_template_string(login_template, error=error)
+                return ojson({"error": error}, 401)
+            return _LOGIN_TPL.render(error=error)
     
-    login_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Teacher Login</title>
-        <style>
-            body { 
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                display: flex; 
-                justify-content: center; 
-                align-items: center; 
-                height: 100vh; 
-                margin: 0; 
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                color: white;
-            }
-            .login-container { 
-                background: rgba(255, 255, 255, 0.95); 
-                padding: 50px; 
-                border-radius: 20px; 
-                box-shadow: 0 15px 35px rgba(0, 0, 0, 0.3);
-                backdrop-filter: blur(10px);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                min-width: 350px;
-                text-align: center;
-            }
-            h2 { 
-                color: #1e3c72; 
-                margin-bottom: 30px;
-                font-size: 2rem;
-                font-weight: 600;
-            }
-            .login-icon {
-                font-size: 4rem;
-                color: #1e3c72;
-                margin-bottom: 20px;
-            }
-            input[type="password"] { 
-                width: 100%; 
-                padding: 15px; 
-                margin: 15px 0; 
-                border: 2px solid #e3f2fd; 
-                border-radius: 10px; 
-                font-size: 16px;
-                background: white;
-                color: #1e3c72;
-                transition: all 0.3s ease;
-                box-sizing: border-box;
-            }
-            input[type="password"]:focus {
-                outline: none;
-                border-color: #2a5298;
-                box-shadow: 0 0 10px rgba(42, 82, 152, 0.3);
-            }
-            button { 
-                width: 100%; 
-                padding: 15px; 
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); 
-                color: white; 
-                border: none; 
-                border-radius: 10px; 
-                cursor: pointer; 
-                font-size: 16px;
-                font-weight: bold;
-                transition: all 0.3s ease;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            button:hover { 
-                background: linear-gradient(135deg, #0d47a1 0%, #1e3c72 100%);
-                transform: translateY(-2px);
-                box-shadow: 0 8px 25px rgba(0, 0, 0, 0.3);
-            }
-            .error { 
-                color: #f44336; 
-                margin-top: 15px; 
-                padding: 10px;
-                background: rgba(244, 67, 54, 0.1);
-                border-radius: 5px;
-                border: 1px solid rgba(244, 67, 54, 0.3);
-            }
-            .subtitle {
-                color: #666;
-                margin-bottom: 30px;
-                font-style: italic;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="login-container">
-            <div class="login-icon">🎮</div>
-            <h2>Teacher Dashboard</h2>
-            <p class="subtitle">Tournament Management Portal</p>
-            <form method="POST">
-                <input type="password" name="password" placeholder="Enter teacher password" required>
-                <button type="submit">Access Dashboard</button>
-                {% if error %}
-                <div class="error">{{ error }}</div>
-                {% endif %}
-            </form>
-        </div>
-    </body>
-    </html>
-    """
-    return render_template_string(login_template)
+    return _LOGIN_TPL.render()
 
 @app.route('/teacher/logout')
 def teacher_logout():
     """Logout teacher"""
-    session.pop('teacher_authenticated', None)
-    return redirect(url_for('home'))
+    response = redirect(url_for('home'))
+    response.delete_cookie(TOKEN_COOKIE)
+    return response
 
 @app.route('/teacher/update-payment', methods=['POST'])
 @require_teacher_auth
 def update_payment():
-    """Update payment status for a player"""
+    """Update payment status for one or more players in a single batch"""
     try:
         data = request.get_json()
-        team_id = data.get('team_id')
-        player = data.get('player')  # 'player1' or 'player2'
-        payment_status = data.get('payment_status')  # 'Yes' or 'No'
-        
-        if not all([team_id, player, payment_status]):
-            return jsonify({"error": "Missing required fields"}), 400
-        
-        if player not in ['player1', 'player2']:
-            return jsonify({"error": "Invalid player specified"}), 400
-        
-        if payment_status not in ['Yes', 'No']:
-            return jsonify({"error": "Invalid payment status"}), 400
-        
+
+        # Accept either a single {team_id, player, payment_status} (legacy)
+        # or {"updates": [...]} carrying several edits at once
+        updates = data.get('updates') if 'updates' in data else [data]
+        if not updates:
+            return ojson({"error": "Missing required fields"}, 400)
+
+        for update in updates:
+            if not all([update.get('team_id'), update.get('player'),
+                        update.get('payment_status')]):
+                return ojson({"error": "Missing required fields"}, 400)
+            if update['player'] not in ['player1', 'player2']:
+                return ojson({"error": "Invalid player specified"}, 400)
+            if update['payment_status'] not in ['Yes', 'No']:
+                return ojson({"error": "Invalid payment status"}, 400)
+
         sheet = get_google_sheet()
         if not sheet:
-            return jsonify({"error": "Cannot connect to Google Sheets"}), 500
-        
-        # Find the row with the matching team ID
-        records = sheet.get_all_records()
-        row_index = None
-        
-        for i, record in enumerate(records):
-            if record.get('Team ID') == team_id:
-                row_index = i + 2  # +2 because sheets are 1-indexed and we have a header row
-                break
-        
-        if row_index is None:
-            return jsonify({"error": "Team ID not found"}), 404
-        
-        # Update the appropriate column
-        if player == 'player1':
-            col_index = 5  # Player 1 Payment Agreement column (E)
-        else:  # player2
-            col_index = 9  # Player 2 Payment Agreement column (I)
-        
-        # Update the cell
-        sheet.update_cell(row_index, col_index, payment_status)
-        
-        return jsonify({
+            return ojson({"error": "Cannot connect to Google Sheets"}, 500)
+
+        # Resolve each team's row once via the in-memory index
+        rows = {}
+        for update in updates:
+            team_id = update['team_id']
+            if team_id not in rows:
+                row = _team_row(sheet, team_id)
+                if row is None:
+                    return ojson({"error": f"Team ID {team_id} not found"}, 404)
+                rows[team_id] = row
+
+        # Apply every edit with a single values.batchUpdate POST - one HTTP
+        # round trip no matter how many cells change
+        data = []
+        for update in updates:
+            row = rows[update['team_id']]
+            col = 'E' if update['player'] == 'player1' else 'I'
+            data.append({
+                'range': f"'{sheet.title}'!{col}{row}",
+                'values': [[update['payment_status']]]
+            })
+        _sheet_call(sheet.spreadsheet.values_batch_update, body={
+            'valueInputOption': 'RAW',
+            'data': data
+        })
+        _invalidate_records_cache()
+
+        return ojson({
             "success": True,
-            "message": f"Payment status updated for {player} of {team_id}",
-            "team_id": team_id,
-            "player": player,
-            "new_status": payment_status
+            "message": f"Updated payment status for {len(updates)} player(s)",
+            "updated": updates
         })
-        
+
     except Exception as e:
-        print(f"Error updating payment: {e}")
-        return jsonify({"error": str(e)}), 500
+        log.exception("Error updating payment")
+        return ojson({"error": str(e)}, 500)
+
+# The local journal keeps one long-lived append handle so each row costs a
+# write instead of an open/write/close. Every record is flushed to the OS
+# before the 202 goes out - the journal is what makes it safe for the
+# flusher to acknowledge registrations that haven't reached Sheets yet
+_JOURNAL_PATH = 'tournament_registrations.txt'
+_journal_fh = None
+_journal_lock = threading.Lock()
 
 def save_to_local_file(row_data):
-    """Fallback method to save data locally"""
+    """Append a row to the local registration journal"""
+    global _journal_fh
     try:
-        filename = 'tournament_registrations.txt'
-        with open(filename, 'a', encoding='utf-8') as f:
-            f.write('|'.join(str(item) for item in row_data) + '\n')
-        print(f"Data saved to {filename}")
+        with _journal_lock:
+            if _journal_fh is None:
+                _journal_fh = open(_JOURNAL_PATH, 'ab')
+                atexit.register(_journal_fh.close)
+            _journal_fh.write(
+                ('|'.join(str(item) for item in row_data) + '\n').encode('utf-8'))
+            _journal_fh.flush()
     except Exception as e:
-        print(f"Error saving to local file: {e}")
+        log.exception("Error saving to local file")
 
 @app.route('/get-registrations')
 def get_registrations():
@@ -666,18 +752,20 @@ def get_registrations():
     try:
         sheet = get_google_sheet()
         if not sheet:
-            return jsonify({"error": "Cannot connect to Google Sheets"}), 500
-        
-        records = sheet.get_all_records()
-        return jsonify({
+            return ojson({"error": "Cannot connect to Google Sheets"}, 500)
+
+        records = get_cached_records(sheet)
+        return ojson({
             "success": True,
             "registrations": records,
             "count": len(records)
         })
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojson({"error": str(e)}, 500)
 
-if __name__ == '__main__':
-    # For development
+if __name__ == '__main__' and os.getenv('DEV'):
+    # For development only - production runs under gunicorn's gevent workers
+    # (see Procfile), which monkey-patch blocking I/O so one worker can hold
+    # many requests open while they wait on Google
     app.run(debug=True, host='0.0.0.0', port=5000)
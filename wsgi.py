@@ -0,0 +1,2 @@
+"""WSGI entrypoint for production servers (see Procfile)"""
+from main import app  # noqa: F401